@@ -7,16 +7,134 @@ and calculate credit points based on certification type and validity.
 
 import os
 import json
+import asyncio
+import importlib
+import logging
 import sqlite3
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
-from typing import TypedDict, Annotated
+from functools import lru_cache, partial
+import httpx
+from typing import TypedDict, Annotated, Optional, Tuple
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
 from langgraph.prebuilt import create_react_agent
 from langchain_core.tools import tool
 
 
+log = logging.getLogger(__name__)
+
+# "Expires: <Month> <day>, <year>" / "Expiration Date: ..." in one pattern,
+# with a bare "<Month> <day>, <year>" as the fallback
+_EXPIRY_RE = re.compile(
+    r'(?:expires?:?\s*|expir(?:y|ation)?\s*date:?\s*)([A-Za-z]+)\s+(\d+),\s+(\d{4})',
+    re.IGNORECASE
+)
+_DATE_RE = re.compile(r'([A-Za-z]+)\s+(\d+),\s+(\d{4})')
+
+_MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4,
+    "may": 5, "june": 6, "july": 7, "august": 8,
+    "september": 9, "october": 10, "november": 11, "december": 12,
+}
+
+# Credly badge URLs
+_URL_RE = re.compile(r'https?://(?:www\.)?credly\.com/badges/[a-zA-Z0-9\-]+')
+
+# Upper bound on badges scraped concurrently for one message
+_MAX_SCRAPE_WORKERS = 4
+
+# Long-lived pool for scraping, so each worker thread keeps its browser
+# (the scraper holds one WebDriver per thread)
+_SCRAPE_EXECUTOR = ThreadPoolExecutor(max_workers=_MAX_SCRAPE_WORKERS)
+
+# Phrasing around the cert name in hypothetical queries
+# (e.g. "If I clear <cert> how many points will I get?")
+_HYPO_STRIP = re.compile(
+    r'\b(if i (clear|get|pass)|how many (credit )?points (will|do) i get( for)?|what about)\b',
+    re.IGNORECASE
+)
+
+# Queries mentioning several certs are left to the agent to total up
+_HYPO_MULTI = re.compile(r'\b(and|both)\b|,', re.IGNORECASE)
+
+# Scraping function from webscrap_cred_v2, resolved on first use.
+# Scraping always runs in-process: do not shell out to the scraper with
+# subprocess, as a fork/exec per lookup costs far more than the call itself.
+_scrape_fn = None
+
+
+def _get_scrape_fn():
+    """Import the scraper module once and return its scraping function."""
+    global _scrape_fn
+    if _scrape_fn is None:
+        scraper_module = importlib.import_module("webscrap_cred_v2")
+        # Prefer scrape_credly_alternative, fall back to scrape_credly
+        _scrape_fn = (getattr(scraper_module, "scrape_credly_alternative", None)
+                      or getattr(scraper_module, "scrape_credly", None))
+    return _scrape_fn
+
+
+# Certification categories are static, so read them once at import
+try:
+    with closing(sqlite3.connect('certifications_data.db')) as _conn:
+        _CATEGORIES = _conn.execute(
+            "SELECT cert_name, points FROM certifications_data ORDER BY points DESC"
+        ).fetchall()
+except sqlite3.Error as e:
+    # Every points lookup fails until the process is restarted
+    log.error("Could not load certification categories (run sqlite_cert.py?): %s", e)
+    _CATEGORIES = []
+
+# (category, points, keywords) for each category, keywords being the
+# words longer than two characters in the category name
+_CATEGORY_INDEX = [
+    (category_name, points, frozenset(
+        word
+        for word in category_name.lower().replace(' or ', ' ').replace(' and ', ' ').split()
+        if len(word) > 2
+    ))
+    for category_name, points in _CATEGORIES
+]
+
+
+@lru_cache(maxsize=256)
+def _match_points(cert_name_lower: str) -> Optional[Tuple[str, float]]:
+    """Return the (category, points) matching a lowercased cert name, or None."""
+    # Check if any category keyword matches the certification name
+    for category_name, points, keywords in _CATEGORY_INDEX:
+        if any(keyword in cert_name_lower for keyword in keywords):
+            return category_name, points
+    
+    # If no match found, return the last category (lowest points)
+    if _CATEGORIES:
+        return _CATEGORIES[-1]
+    return None
+
+
+# Category-name words too generic to identify a cert on their own
+_GENERIC_KEYWORDS = frozenset({"any", "anything", "else"})
+
+# (category, points, keywords) for the fast path: generic words and the
+# default (last) category are left out, so only a specific cert word
+# such as "professional" or "hashicorp" answers without the agent
+_SPECIFIC_CATEGORY_INDEX = [
+    (category_name, points, keywords - _GENERIC_KEYWORDS)
+    for category_name, points, keywords in _CATEGORY_INDEX[:-1]
+]
+
+
+def _match_specific_category(cert_name_lower: str) -> Optional[Tuple[str, float]]:
+    """Return the (category, points) whose specific keywords are whole words of a cert name, or None."""
+    words = set(re.findall(r'[a-z0-9]+', cert_name_lower))
+    for category_name, points, keywords in _SPECIFIC_CATEGORY_INDEX:
+        if keywords & words:
+            return category_name, points
+    return None
+
+
 @tool
 def extract_certification_data(url: str) -> str:
     """
@@ -35,28 +153,15 @@ def extract_certification_data(url: str) -> str:
         JSON string with structure: {"Name": "...", "Certifications": [{"Certification Expiry Date": "..."}]}
     """
     try:
-        # Import and call the scraper directly
-        import sys
-        import importlib.util
-        
-        # Load the scraper module
-        spec = importlib.util.spec_from_file_location("webscrap_cred_v2", "webscrap_cred_v2.py")
-        scraper_module = importlib.util.module_from_spec(spec)
-        sys.modules["webscrap_cred_v2"] = scraper_module
-        spec.loader.exec_module(scraper_module)
+        scrape = _get_scrape_fn()
+        if scrape is None:
+            return json.dumps({"error": "Could not find scraping function in webscrap_cred_v2.py"})
         
         # Call the scraping function with the URL
-        data = scraper_module.scrape_credly_alternative(url)
+        data = scrape(url)
         
         # Return as JSON string for the LLM
-        return json.dumps(data, indent=2)
-    except AttributeError:
-        # If scrape_credly_alternative doesn't exist, try other function names
-        try:
-            data = scraper_module.scrape_credly(url)
-            return json.dumps(data, indent=2)
-        except:
-            return json.dumps({"error": "Could not find scraping function in webscrap_cred_v2.py"})
+        return json.dumps(data, separators=(',', ':'))
     except Exception as e:
         return json.dumps({"error": f"Error calling scraper: {str(e)}"})
 
@@ -80,51 +185,73 @@ def get_certification_points(cert_name: str) -> str:
         Use the "points" value in your response to the user.
     """
     try:
-        conn = sqlite3.connect('certifications_data.db')
-        cursor = conn.cursor()
-        
-        # Get all certification categories from database
-        cursor.execute("SELECT cert_name, points FROM certifications_data ORDER BY points DESC")
-        categories = cursor.fetchall()
-        conn.close()
-        
-        # Normalize cert name for matching
-        cert_name_lower = cert_name.lower()
-        
-        # Try to match against each category in database
-        for category_name, points in categories:
-            category_lower = category_name.lower()
-            
-            # Extract keywords from category name
-            keywords = []
-            for word in category_lower.replace(' or ', ' ').replace(' and ', ' ').split():
-                if len(word) > 2:
-                    keywords.append(word)
-            
-            # Check if any keyword matches the certification name
-            for keyword in keywords:
-                if keyword in cert_name_lower:
-                    return json.dumps({
-                        "category": category_name,
-                        "points": points,
-                        "cert_name": cert_name
-                    })
-        
-        # If no match found, return the last category (lowest points)
-        if categories:
-            default_category, default_points = categories[-1]
-            return json.dumps({
-                "category": default_category,
-                "points": default_points,
-                "cert_name": cert_name
-            })
-        else:
+        match = _match_points(cert_name.lower())
+        if match is None:
             return json.dumps({"error": "No categories found in database"})
+        
+        category_name, points = match
+        return json.dumps({
+            "category": category_name,
+            # Whole points as ints, so the agent says "10", not "10.0"
+            "points": int(points) if float(points).is_integer() else points,
+            "cert_name": cert_name
+        })
             
     except Exception as e:
         return json.dumps({"error": f"Database error: {str(e)}"})
 
 
+def _check_validity(expiry_date_str: str, current_date: Optional[datetime] = None) -> dict:
+    """
+    Check an expiry date string and return the validity result as a dict.
+    
+    current_date lets a caller checking several badges for one request
+    capture the time once; it defaults to now.
+    """
+    # Check for "No Expiration Date" first
+    expiry_lower = expiry_date_str.lower()
+    if "no expiration" in expiry_lower or "does not expire" in expiry_lower:
+        return {
+            "is_valid": True,
+            "message": "Valid - Does not expire",
+            "days_remaining": "N/A"
+        }
+    
+    # Extract date from string
+    expiry_date = None
+    for pattern in (_EXPIRY_RE, _DATE_RE):
+        date_match = pattern.search(expiry_date_str)
+        if date_match:
+            month_name, day, year = date_match.groups()
+            month = _MONTHS.get(month_name.lower())
+            if month is None:
+                continue
+            try:
+                expiry_date = datetime(int(year), month, int(day))
+                break
+            except ValueError:
+                continue
+    
+    if expiry_date:
+        if current_date is None:
+            current_date = datetime.now()
+        is_valid = current_date < expiry_date
+        days_remaining = (expiry_date - current_date).days
+        
+        return {
+            "is_valid": is_valid,
+            "expiry_date": expiry_date.strftime("%Y-%m-%d"),
+            "days_remaining": days_remaining if is_valid else 0,
+            "message": "Valid" if is_valid else "Expired"
+        }
+    
+    return {
+        "is_valid": False,
+        "message": "Expired - Could not parse date",
+        "days_remaining": 0
+    }
+
+
 @tool
 def check_certification_validity(expiry_date_str: str) -> str:
     """
@@ -142,49 +269,7 @@ def check_certification_validity(expiry_date_str: str) -> str:
         - Use this to determine if user gets points (expired = 0 points)
     """
     try:
-        # Check for "No Expiration Date" first
-        if "no expiration" in expiry_date_str.lower() or "does not expire" in expiry_date_str.lower():
-            return json.dumps({
-                "is_valid": True,
-                "message": "Valid - Does not expire",
-                "days_remaining": "N/A"
-            })
-        
-        # Extract date from string
-        date_patterns = [
-            r'expires?:?\s*(\w+\s+\d+,\s+\d{4})',
-            r'expir[y|ation]*\s*date:?\s*(\w+\s+\d+,\s+\d{4})',
-            r'(\w+\s+\d+,\s+\d{4})',
-        ]
-        
-        expiry_date = None
-        for pattern in date_patterns:
-            date_match = re.search(pattern, expiry_date_str, re.IGNORECASE)
-            if date_match:
-                expiry_date_str_clean = date_match.group(1)
-                try:
-                    expiry_date = datetime.strptime(expiry_date_str_clean, "%B %d, %Y")
-                    break
-                except ValueError:
-                    continue
-        
-        if expiry_date:
-            current_date = datetime.now()
-            is_valid = current_date < expiry_date
-            days_remaining = (expiry_date - current_date).days
-            
-            return json.dumps({
-                "is_valid": is_valid,
-                "expiry_date": expiry_date.strftime("%Y-%m-%d"),
-                "days_remaining": days_remaining if is_valid else 0,
-                "message": "Valid" if is_valid else "Expired"
-            })
-        
-        return json.dumps({
-            "is_valid": False,
-            "message": "Expired - Could not parse date",
-            "days_remaining": 0
-        })
+        return json.dumps(_check_validity(expiry_date_str))
         
     except Exception as e:
         return json.dumps({
@@ -241,15 +326,26 @@ User: "How many points for https://credly.com/badges/abc123?"
 Be precise and follow the formats exactly!"""
 
 
+# Keep-alive connection pool for sync Groq calls. No async client is passed:
+# an httpx.AsyncClient binds its connections to the first event loop that
+# uses it, so it would break on a second asyncio.run(); ChatGroq keeps its
+# own async client instead.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_HTTP_CLIENT = httpx.Client(limits=_HTTP_LIMITS, timeout=30.0)
+
+# Shared LLM client, created once so its HTTP connections are reused
+_LLM = ChatGroq(
+    model="llama-3.3-70b-versatile",
+    temperature=0,
+    api_key=os.getenv("GROQ_API_KEY"),
+    http_client=_HTTP_CLIENT
+)
+
+
 def create_certification_agent():
     """Create and compile the LangGraph ReAct agent."""
     
-    # Initialize LLM
-    llm = ChatGroq(
-        model="llama-3.3-70b-versatile",
-        temperature=0,
-        api_key=os.getenv("GROQ_API_KEY")
-    )
+    llm = _LLM
     
     # Define tools
     tools = [
@@ -268,6 +364,151 @@ def create_certification_agent():
 app = create_certification_agent()
 
 
+def _initial_state(user_input: str) -> dict:
+    """Build the agent input state, prepending the system prompt."""
+    return {
+        "messages": [
+            SystemMessage(content=SYSTEM_PROMPT),
+            HumanMessage(content=user_input)
+        ]
+    }
+
+
+def _format_points(points) -> str:
+    """Format a points value without a trailing '.0' (10.0 -> '10', 2.5 -> '2.5')."""
+    return f"{points:g}"
+
+
+def _extract_hypothetical_cert(user_input: str) -> Optional[str]:
+    """
+    Extract the cert name from a hypothetical query such as
+    "If I clear AWS Solution Architect Professional how many points will I get?".
+    
+    Returns None when the query is not a simple single-cert hypothetical.
+    """
+    if _URL_RE.search(user_input) or not _HYPO_STRIP.search(user_input):
+        return None
+    
+    cert_name = _HYPO_STRIP.sub(' ', user_input)
+    cert_name = ' '.join(cert_name.split()).strip(' ?.!')
+    if not cert_name or _HYPO_MULTI.search(cert_name):
+        return None
+    return cert_name
+
+
+def _answer_url(url: str, current_date: Optional[datetime] = None) -> Optional[str]:
+    """
+    Run the extract -> validity -> points workflow for a Credly URL in Python
+    and format the reply from the SYSTEM_PROMPT templates.
+    
+    Failed or empty scrapes are reported directly, since the agent would
+    only scrape the same URL again. Returns None if no scraper or no
+    categories are available, so the agent can handle it.
+    """
+    scrape = _get_scrape_fn()
+    if scrape is None:
+        return None
+    
+    try:
+        data = scrape(url)
+    except Exception as e:
+        data = {"Error": str(e)}
+    if "Error" in data:
+        return f"Sorry, I could not read the Credly badge at {url} ({data['Error']}). Please try again later."
+    certifications = data.get("Certifications") or []
+    if not certifications:
+        return f"Sorry, I could not find a certification on the Credly badge at {url}."
+    
+    # The badge page heading is the certification name
+    cert_name = data.get("Name", "N/A")
+    if cert_name == "N/A":
+        cert_name = certifications[0].get("Certification Name", "N/A")
+    expiry_date_str = certifications[0].get("Certification Expiry Date", "N/A")
+    
+    validity = _check_validity(expiry_date_str, current_date)
+    match = _match_points(cert_name.lower())
+    if match is None:
+        return None
+    points = _format_points(match[1])
+    
+    if validity["is_valid"]:
+        return (f"I see that this is a {cert_name}. And it is still valid. "
+                f"So you can be granted {points} credit points for it.")
+    return ("Sorry, your cert has expired. So you won't get any credit points. "
+            f"But otherwise you would have stood to obtain {points} credit points for your {cert_name}")
+
+
+def _badge_urls(user_input: str) -> list:
+    """Return each distinct Credly badge URL in the message, in order."""
+    return list(dict.fromkeys(_URL_RE.findall(user_input)))
+
+
+def _join_url_answers(responses) -> Optional[str]:
+    """Join per-URL replies, or None if any badge could not be read."""
+    if any(response is None for response in responses):
+        return None
+    return "\n".join(responses)
+
+
+def _answer_hypothetical(user_input: str) -> Optional[str]:
+    """Answer a simple single-cert hypothetical query, or return None."""
+    cert_name = _extract_hypothetical_cert(user_input)
+    if cert_name is not None:
+        # Only answer when a specific cert word matched: the phrasing alone
+        # also fits questions that are not about certs ("What about my
+        # company?"), which go to the agent
+        match = _match_specific_category(cert_name.lower())
+        if match is not None:
+            _, points = match
+            return f"You will get {_format_points(points)} credit points for that cert."
+    
+    return None
+
+
+def _answer_directly(user_input: str) -> Optional[str]:
+    """
+    Answer queries that need no LLM reasoning without invoking the agent.
+    
+    Returns the response, or None if the query should go to the agent.
+    """
+    urls = _badge_urls(user_input)
+    if urls:
+        # Validity for every badge in the request is checked against one time
+        answer_url = partial(_answer_url, current_date=datetime.now())
+        try:
+            if len(urls) == 1:
+                return answer_url(urls[0])
+            
+            # Scraping is I/O-bound, so the badges are fetched in parallel
+            responses = list(_SCRAPE_EXECUTOR.map(answer_url, urls))
+        except Exception:
+            return None
+        return _join_url_answers(responses)
+    
+    return _answer_hypothetical(user_input)
+
+
+async def _answer_directly_async(user_input: str) -> Optional[str]:
+    """Async variant of _answer_directly that scrapes badges off the event loop."""
+    urls = _badge_urls(user_input)
+    if urls:
+        loop = asyncio.get_running_loop()
+        current_date = datetime.now()
+        
+        # _SCRAPE_EXECUTOR's threads own the browsers and cap concurrent
+        # scrapes across all callers, so the default executor is not used
+        try:
+            responses = await asyncio.gather(*(
+                loop.run_in_executor(_SCRAPE_EXECUTOR, _answer_url, url, current_date)
+                for url in urls
+            ))
+        except Exception:
+            return None
+        return _join_url_answers(responses)
+    
+    return _answer_hypothetical(user_input)
+
+
 def run_agent(user_input: str):
     """
     Run the certification credit agent with a user input.
@@ -278,21 +519,51 @@ def run_agent(user_input: str):
     Returns:
         Agent's response
     """
-    # Prepend system message to the conversation
-    initial_state = {
-        "messages": [
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=user_input)
-        ]
-    }
+    response = _answer_directly(user_input)
+    if response is not None:
+        return response
     
-    result = app.invoke(initial_state)
+    result = app.invoke(_initial_state(user_input))
     
     # Get the last message (agent's final response)
     last_message = result["messages"][-1]
     return last_message.content
 
 
+async def run_agent_async(user_input: str):
+    """
+    Async variant of run_agent, so independent queries can overlap their
+    Groq round-trips (e.g. with asyncio.gather).
+    
+    Note that Groq enforces per-key request and token rate limits; when
+    running many queries concurrently, bound them (e.g. with an
+    asyncio.Semaphore) to stay within your plan's limits.
+    
+    Args:
+        user_input: User's question or Credly URL
+        
+    Returns:
+        Agent's response
+    """
+    response = await _answer_directly_async(user_input)
+    if response is not None:
+        return response
+    
+    result = await app.ainvoke(_initial_state(user_input))
+    
+    # Get the last message (agent's final response)
+    last_message = result["messages"][-1]
+    return last_message.content
+
+
+async def _run_queries(queries):
+    """Run independent queries concurrently, returning responses or exceptions."""
+    return await asyncio.gather(
+        *(run_agent_async(query) for query in queries),
+        return_exceptions=True
+    )
+
+
 # Example usage
 if __name__ == "__main__":
     print("Certification Credit Points Agent (ReAct)")
@@ -305,10 +576,11 @@ if __name__ == "__main__":
         "If I clear AWS Solution Architect Professional how many points will I get?"
     ]
     
-    for query in queries:
+    responses = asyncio.run(_run_queries(queries))
+    
+    for query, response in zip(queries, responses):
         print(f"\nUser: {query}")
-        try:
-            response = run_agent(query)
+        if isinstance(response, Exception):
+            print(f"Error: {response}")
+        else:
             print(f"System: {response}")
-        except Exception as e:
-            print(f"Error: {e}")
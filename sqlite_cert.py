@@ -2,15 +2,13 @@ import sqlite3
 
 # Connect to the SQLite database (or create it if it doesn't exist)
 connection = sqlite3.connect('certifications_data.db')
-cursor = connection.cursor()
 
-# Create the table 'certifications_data' with 'certification_name' and 'points' columns
-cursor.execute('''
-     CREATE TABLE IF NOT EXISTS certifications_data (
-        cert_name TEXT NOT NULL,
-        points INTEGER
-    )
-''')
+# The agent only reads this file, so keep the default rollback journal: a
+# database left in WAL mode makes every reader create -wal/-shm files next
+# to it (and fail in a read-only directory). This also converts files
+# seeded by the earlier WAL version of this script.
+connection.execute("PRAGMA journal_mode=DELETE")
+cursor = connection.cursor()
 
 # Insert 3-4 rows into the table
 certificate_data = [
@@ -19,10 +17,33 @@ certificate_data = [
     ('Anything Else', 2.5)
 ]
 
-cursor.executemany("INSERT INTO certifications_data VALUES (?, ?)", certificate_data)
+# Create and seed the table in a single transaction
+with connection:
+    cursor.execute("BEGIN")
+
+    # Create the table 'certifications_data' with 'cert_name' and 'points' columns
+    cursor.execute('''
+         CREATE TABLE IF NOT EXISTS certifications_data (
+            cert_name TEXT NOT NULL,
+            points REAL NOT NULL
+        )
+    ''')
+
+    # cert_name is keyed by a unique index rather than a PRIMARY KEY, so
+    # tables created by older versions of this script get the same key:
+    # drop any duplicate rows and add it so re-runs are no-ops
+    cursor.execute('''
+        DELETE FROM certifications_data WHERE rowid NOT IN (
+            SELECT MIN(rowid) FROM certifications_data GROUP BY cert_name
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS certifications_data_cert_name
+        ON certifications_data (cert_name)
+    ''')
+
+    cursor.executemany("INSERT OR IGNORE INTO certifications_data VALUES (?, ?)", certificate_data)
 
-# Commit the changes and close the connection
-connection.commit()
 connection.close()
 
 print("Table 'certifications_data' created and data inserted successfully!")
@@ -1,293 +1,1075 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, JavascriptException, ScriptTimeoutException, WebDriverException
+from lxml import etree
+import aiohttp
+import requests
+from collections import OrderedDict
+from datetime import date
+from multiprocessing.util import Finalize
+import asyncio
+import atexit
+import functools
 import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import threading
 import time
 
-def scrape_credly(url):
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:  # Playwright is optional; without it batches use the Selenium pool
+    async_playwright = None
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Credly serves badge and profile data as JSON at <page URL>.json
+CREDLY_BASE_URL = "https://www.credly.com"
+API_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": USER_AGENT,
+}
+BADGE_ID_RE = re.compile(r"/badges/([a-zA-Z0-9\-]+)")
+USER_SLUG_RE = re.compile(r"/users/([^/?#]+)")
+
+log = logging.getLogger("credly")
+
+_session = requests.Session()
+_session.headers.update(API_HEADERS)
+
+# Local cache of API responses and their ETags, so unchanged badges are
+# revalidated with If-None-Match and come back as 304 without a body
+CACHE_DB_PATH = "credly_cache.db"
+
+# Scraped results are reused for this long (seconds), keyed by badge UUID;
+# the most recently used SCRAPE_CACHE_SIZE are also kept in memory
+SCRAPE_CACHE_TTL = 24 * 60 * 60
+SCRAPE_CACHE_SIZE = 4096
+_scrape_cache = OrderedDict()  # (scraper, key) -> (scraped_at, result JSON), oldest first
+_scrape_cache_lock = threading.Lock()
+_cache_schema_ready = False  # Cache tables created by this process
+
+# CSS equivalents of scrape_credly_alternative's XPaths, in priority order
+NAME_CSS_SELECTORS = ["h1[class*='profile']", "h1", "[class*='user-name']"]
+BADGE_CSS_SELECTORS = ["[class*='badge'][class*='card']", "[data-badge-id]", "a[href*='/badges/']"]
+
+# scrape_credly's name and badge card matchers, in priority order, as
+# (selector, tag, class substrings, required attribute); class matches are
+# case-insensitive substring matches
+PROFILE_NAME_MATCHERS = [
+    ("h1[class*='profile' i]", "h1", ("profile",), None),
+    ("h1", "h1", (), None),
+    ("div[class*='user' i][class*='name' i]", "div", ("user", "name"), None),
+]
+PROFILE_CARD_MATCHERS = [
+    ("div[class*='badge' i]", "div", ("badge",), None),
+    ("div[class*='card' i]", "div", ("card",), None),
+    ("a[class*='badge' i]", "a", ("badge",), None),
+    ("div[data-badge-id]", "div", (), "data-badge-id"),
+]
+
+# Badge containers scrape_credly waits for before parsing: any card it accepts
+PROFILE_BADGE_CSS = ", ".join(matcher[0] for matcher in PROFILE_CARD_MATCHERS)
+
+# Tags inside a badge card that may hold the certification name, and
+# card texts that are UI elements rather than names
+CARD_NAME_TAGS = {"h2", "h3", "h4", "div", "span"}
+CARD_UI_TEXTS = {"view badge", "share", "download", "verify"}
+
+# Words marking a badge card text node as its issue or expiry date
+# ("issued" wins if a node has both)
+ISSUED_WORDS = ("issued", "earned")
+EXPIRY_WORDS = ("expires", "expiration")
+
+# In-page scroll-to-load loop: scroll one viewport every SCROLL_POLL_MS and
+# resolve once the page sits at the bottom without growing for
+# SCROLL_IDLE_POLLS checks in a row. Scrolling a viewport at a time passes
+# through every lazy-load trigger instead of jumping over them.
+SCROLL_POLL_MS = 150
+SCROLL_IDLE_POLLS = 2
+SCROLL_TO_END_JS = """
+const pollMs = arguments[0], idlePolls = arguments[1];
+return new Promise(resolve => {
+    let lastHeight = 0, idle = 0;
+    function step() {
+        window.scrollBy(0, window.innerHeight);
+        setTimeout(() => {
+            const height = document.documentElement.scrollHeight;
+            const atBottom = window.scrollY + window.innerHeight >= height - 1;
+            idle = atBottom && height === lastHeight ? idle + 1 : 0;
+            lastHeight = height;
+            if (idle >= idlePolls) {
+                resolve();
+            } else {
+                step();
+            }
+        }, pollMs);
+    }
+    step();
+});
+"""
+
+# The same loop for Playwright's page.evaluate, which takes a function
+# (whose returned promise it awaits) instead of a script body
+SCROLL_TO_END_PW_JS = f"args => (function () {{{SCROLL_TO_END_JS}}}).apply(null, args)"
+
+# Upper bound (seconds) for in-page scripts such as the scroll loop
+SCRIPT_TIMEOUT = 10
+
+# Interval for polling the page for readiness
+POLL_INTERVAL = 0.05
+
+# True once the newly loaded document has an element matching arguments[0].
+# _load_page tags the previous document so it can never satisfy this.
+PAGE_READY_JS = "return !window.__staleDocument && !!document.querySelector(arguments[0]);"
+
+# Requests the scrapers never need: images, fonts and analytics/ad trackers.
+# Stylesheets are still loaded since the rendered badge text depends on them.
+TRACKER_HOSTS = ["google-analytics", "googletagmanager", "doubleclick", "segment.io", "segment.com"]
+BLOCKED_URL_PATTERNS = ["*.woff*", "*.ttf"] + [f"*{host}*" for host in TRACKER_HOSTS]
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Chrome switches that turn off background work the scrapers never use
+CHROME_LEAN_FLAGS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--mute-audio",
+    "--disable-renderer-backgrounding",
+]
+
+# chromedriver on PATH; if there is none, Selenium Manager downloads a matching one
+CHROMEDRIVER_PATH = shutil.which("chromedriver")
+
+
+def _build_options():
     """
-    Scrape user name and certification details from Credly profile page.
+    Build the ChromeOptions shared by every scraper browser.
     """
-    # Set up Selenium WebDriver
-    service = Service(executable_path="<Path of ChromeDriver>")  # Update with your ChromeDriver path
     options = webdriver.ChromeOptions()
     options.add_argument("--headless")
     options.add_argument("--disable-gpu")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    for flag in CHROME_LEAN_FLAGS:
+        options.add_argument(flag)
+    # driver.get returns immediately; the scrapers poll for the badges they need
+    options.page_load_strategy = "none"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+CHROME_OPTIONS = _build_options()
+
+# One long-lived Chrome per thread (WebDriver sessions are not thread-safe)
+_driver_local = threading.local()
+
+
+def _get_driver():
+    """
+    Return this thread's shared WebDriver, starting Chrome on first use.
+    """
+    driver = getattr(_driver_local, "driver", None)
+    if driver is None:
+        # Each driver runs its own chromedriver process, so Service is per driver
+        service = Service(executable_path=CHROMEDRIVER_PATH)
+        driver = webdriver.Chrome(service=service, options=CHROME_OPTIONS)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        atexit.register(driver.quit)
+        _driver_local.driver = driver
+    return driver
+
+
+def _scroll_until_loaded(driver):
+    """
+    Scroll through the page until no more content lazy-loads. Badges loaded
+    before SCRIPT_TIMEOUT runs out are kept.
+    """
+    try:
+        driver.execute_script(SCROLL_TO_END_JS, SCROLL_POLL_MS, SCROLL_IDLE_POLLS)
+    except ScriptTimeoutException:
+        pass
+
+
+def _load_page(driver, url):
+    """
+    Start loading url without waiting for it to finish (page_load_strategy
+    "none"); callers then poll for readiness with _wait_for_page.
+    """
+    # The shared driver still shows the previous page until the new one commits
+    driver.execute_script("window.__staleDocument = true;")
+    driver.get(url)
+
+
+def _wait_for_page(driver, css_selector, timeout):
+    """
+    Wait until the new page has an element matching css_selector.
+    Raises TimeoutException after timeout seconds.
+    """
+    # The check script can fail while the old document is torn down; that
+    # only means the page is not ready yet
+    WebDriverWait(
+        driver, timeout, poll_frequency=POLL_INTERVAL, ignored_exceptions=(JavascriptException,)
+    ).until(lambda d: d.execute_script(PAGE_READY_JS, css_selector))
+
+
+def _page_is_stale(driver):
+    """
+    True while the driver still shows the document _load_page navigated away from.
+    """
+    try:
+        return bool(driver.execute_script("return !!window.__staleDocument;"))
+    except JavascriptException:
+        return True  # Mid-navigation, so the new document has not committed
+
+
+def _quit_driver():
+    """
+    Quit this thread's shared WebDriver (e.g. after it crashed);
+    the next _get_driver() call starts a fresh one.
+    """
+    driver = getattr(_driver_local, "driver", None)
+    if driver is not None:
+        _driver_local.driver = None
+        atexit.unregister(driver.quit)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+def _credly_api_url(url):
+    """
+    Map a Credly profile or badge page URL to its JSON endpoint (None if neither).
+    """
+    match = USER_SLUG_RE.search(url)
+    if match:
+        return f"{CREDLY_BASE_URL}/users/{match.group(1)}/badges.json"
+    match = BADGE_ID_RE.search(url)
+    if match:
+        return f"{CREDLY_BASE_URL}/badges/{match.group(1)}.json"
+    return None
+
+
+def _format_credly_date(prefix, iso_date):
+    """
+    Format an ISO date from the API the way Credly pages show it,
+    e.g. ("Expires", "2023-01-15") -> "Expires: January 15, 2023".
+    """
+    d = date.fromisoformat(iso_date[:10])
+    return f"{prefix}: {d:%B} {d.day}, {d.year}"
+
+
+def _badge_from_json(badge):
+    """
+    Convert one badge object from the Credly API to a certification dict.
+    """
+    template = badge.get("badge_template") or {}
+    issued_at = badge.get("issued_at_date")
+    expires_at = badge.get("expires_at_date")
+    return {
+        "Certification Name": template.get("name") or badge.get("name") or "N/A",
+        "User Name": (badge.get("issued_to") or "").split(),
+        "Certification Issue Date": _format_credly_date("Issued", issued_at) if issued_at else "N/A",
+        "Certification Expiry Date": _format_credly_date("Expires", expires_at) if expires_at else "No Expiration Date",
+    }
+
+
+def _parse_credly_json(payload):
+    """
+    Build the scraper result from a Credly badge or profile JSON payload.
+    """
+    data = payload["data"]
+    if isinstance(data, list):
+        # Profile: a list of badges, all issued to the same user
+        certifications = [_badge_from_json(badge) for badge in data]
+        name = data[0].get("issued_to", "N/A") if data else "N/A"
+    else:
+        # Single badge: the page heading is the certification name
+        certifications = [_badge_from_json(data)]
+        name = certifications[0]["Certification Name"]
+    return {"Name": name, "Certifications": certifications}
+
+
+def _cache_connection():
+    """
+    Open the local cache database, creating its tables on first use in this process.
+    """
+    global _cache_schema_ready
+    connection = sqlite3.connect(CACHE_DB_PATH, timeout=10)
+    if not _cache_schema_ready:
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, etag TEXT NOT NULL, body TEXT NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_cache ("
+            "scraper TEXT NOT NULL, key TEXT NOT NULL, scraped_at REAL NOT NULL, body TEXT NOT NULL, "
+            "PRIMARY KEY (scraper, key))"
+        )
+        _cache_schema_ready = True
+    return connection
+
+
+def _load_cached_response(api_url):
+    """
+    Return the cached (etag, body) for an API URL, or None.
+    """
+    try:
+        connection = _cache_connection()
+        try:
+            return connection.execute(
+                "SELECT etag, body FROM http_cache WHERE url = ?", (api_url,)
+            ).fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return None
+
+
+def _store_cached_response(api_url, etag, body):
+    """
+    Remember an API response body under its ETag (cache errors are ignored).
+    """
+    try:
+        connection = _cache_connection()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO http_cache (url, etag, body) VALUES (?, ?, ?)",
+                    (api_url, etag, body),
+                )
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        pass
+
+
+def _scrape_cache_key(url):
+    """
+    Key a badge URL by its UUID and a profile URL by its user slug.
+    """
+    match = BADGE_ID_RE.search(url) or USER_SLUG_RE.search(url)
+    return match.group(1) if match else url
+
+
+def _load_scraped(scraper, key):
+    """
+    Return the (scraped_at, result JSON) stored for a scrape, or None.
+    """
+    try:
+        connection = _cache_connection()
+        try:
+            return connection.execute(
+                "SELECT scraped_at, body FROM scrape_cache WHERE scraper = ? AND key = ?", (scraper, key)
+            ).fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return None
+
+
+def _store_scraped(scraper, key, scraped_at, body):
+    """
+    Remember a scraped result (cache errors are ignored).
+    """
+    try:
+        connection = _cache_connection()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO scrape_cache (scraper, key, scraped_at, body) VALUES (?, ?, ?, ?)",
+                    (scraper, key, scraped_at, body),
+                )
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        pass
+
+
+def _remember_scraped(cache_key, entry):
+    """
+    Keep a (scraped_at, result JSON) entry in memory, evicting the least
+    recently used entries beyond SCRAPE_CACHE_SIZE.
+    """
+    with _scrape_cache_lock:
+        _scrape_cache[cache_key] = entry
+        _scrape_cache.move_to_end(cache_key)
+        while len(_scrape_cache) > SCRAPE_CACHE_SIZE:
+            _scrape_cache.popitem(last=False)
+
+
+def _get_scraped(scraper, url):
+    """
+    Return scraper's result for url if scraped within SCRAPE_CACHE_TTL, from
+    memory or the local cache database; None otherwise.
+    """
+    cache_key = (scraper, _scrape_cache_key(url))
+    now = time.time()
+    
+    with _scrape_cache_lock:
+        cached = _scrape_cache.get(cache_key)
+        if cached is not None:
+            if now - cached[0] < SCRAPE_CACHE_TTL:
+                _scrape_cache.move_to_end(cache_key)
+                return json.loads(cached[1])
+            del _scrape_cache[cache_key]  # Expired
+    
+    cached = _load_scraped(*cache_key)
+    if cached and now - cached[0] < SCRAPE_CACHE_TTL:
+        _remember_scraped(cache_key, cached)
+        return json.loads(cached[1])
+    return None
+
+
+def _put_scraped(scraper, url, data):
+    """
+    Cache scraper's result for url. Results with an error or without
+    certifications are not cached.
+    """
+    if data.get("Certifications") and "Error" not in data:
+        cache_key = (scraper, _scrape_cache_key(url))
+        entry = (time.time(), json.dumps(data))
+        _remember_scraped(cache_key, entry)
+        _store_scraped(*cache_key, *entry)
+
+
+def _cached_scrape(scrape):
+    """
+    Decorate a scraper so results scraped within SCRAPE_CACHE_TTL are
+    returned from memory or the local cache database instead of loading
+    the page again.
+    """
+    @functools.wraps(scrape)
+    def wrapper(url):
+        data = _get_scraped(scrape.__name__, url)
+        if data is None:
+            data = scrape(url)
+            _put_scraped(scrape.__name__, url, data)
+        return data
     
-    driver = webdriver.Chrome(service=service, options=options)
+    return wrapper
+
+
+def scrape_credly_api(url):
+    """
+    Fetch user name and certification details from Credly's JSON API.
+    No browser is involved, so this is much faster than the Selenium scrapers.
+    
+    Returns None if the URL is not a Credly badge/profile URL or Credly
+    refuses the request (403), so callers can fall back to Selenium.
+    """
+    api_url = _credly_api_url(url)
+    if api_url is None:
+        return None
+    
+    # Revalidate a cached response instead of downloading it again
+    cached = _load_cached_response(api_url)
+    headers = {"If-None-Match": cached[0]} if cached else {}
     
     try:
-        # Navigate to the URL
-        print(f"  Loading page...")
-        driver.get(url)
-        
-        # Wait for page to load - try multiple possible selectors
-        print(f"  Waiting for content to load...")
-        wait = WebDriverWait(driver, 20)
-        
-        # Wait for the page to be interactive
-        time.sleep(3)  # Additional wait for dynamic content
-        
-        # Scroll to load all badges (lazy loading)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        
-        # Get the page source after JavaScript has rendered
-        content = driver.page_source
+        response = _session.get(api_url, headers=headers, timeout=10)
+        if response.status_code == 304 and cached:
+            return _parse_credly_json(json.loads(cached[1]))
+        if response.status_code == 403:
+            return None
+        response.raise_for_status()
         
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(content, "html.parser")
-        
-        # Extract user name - try multiple possible selectors
-        name = "N/A"
-        name_selectors = [
-            ("h1", {"class": lambda x: x and "profile" in x.lower()}),
-            ("h1", {}),
-            ("div", {"class": lambda x: x and "user" in x.lower() and "name" in x.lower()}),
+        etag = response.headers.get("ETag")
+        if etag:
+            _store_cached_response(api_url, etag, response.text)
+        return _parse_credly_json(response.json())
+    
+    except (requests.RequestException, ValueError, KeyError) as e:
+        log.warning("Error scraping %s: %s", url, e)
+        return {"Name": "N/A", "Certifications": [], "Error": str(e)}
+
+
+def _matches(matcher, tag, attrib):
+    """
+    Check an element's tag and attributes against a PROFILE_*_MATCHERS entry.
+    """
+    _, matcher_tag, class_parts, attribute = matcher
+    if tag != matcher_tag or (attribute and attribute not in attrib):
+        return False
+    classes = attrib.get("class", "").lower()
+    return all(part in classes for part in class_parts)
+
+
+def _date_kind(text):
+    """
+    Return "issued" or "expires" if a text node holds that date, else None.
+    """
+    low = text.lower()
+    if any(word in low for word in ISSUED_WORDS):
+        return "issued"
+    if any(word in low for word in EXPIRY_WORDS):
+        return "expires"
+    return None
+
+
+class BadgeTarget:
+    """
+    lxml parser target collecting scrape_credly's profile name and badge
+    cards in one pass over the page, without building a document tree.
+
+    Each record below collects the text nodes of one element while it is
+    open, and each open card keeps the first text node naming its issue and
+    expiry date; after parser.close(), name and results hold the scraped data.
+    """
+
+    def __init__(self):
+        self.name = "N/A"
+        self.selector = None
+        self.card_count = 0
+        self.results = []
+        # First element per name matcher, and all elements per card matcher
+        self._names = [None] * len(PROFILE_NAME_MATCHERS)
+        self._cards = [[] for _ in PROFILE_CARD_MATCHERS]
+        self._stack = []  # records opened by each open element
+        self._active = []  # records collecting text
+        self._open_cards = []
+        self._text = []
+        self._skip = 0  # inside <script>/<style>
+
+    def _flush(self):
+        if self._text:
+            text = "".join(self._text)
+            self._text = []
+            for record in self._active:
+                record["text"].append(text)
+            if self._open_cards:
+                kind = _date_kind(text)
+                if kind:
+                    text = text.strip()
+                    for card in self._open_cards:
+                        card.setdefault(kind, text)
+
+    def start(self, tag, attrib):
+        self._flush()
+        opened = []
+
+        for i, matcher in enumerate(PROFILE_NAME_MATCHERS):
+            if self._names[i] is None and _matches(matcher, tag, attrib):
+                self._names[i] = {"text": []}
+                opened.append(self._names[i])
+
+        # Name and date candidates inside the cards already open
+        if tag in CARD_NAME_TAGS and self._open_cards:
+            record = {"text": []}
+            opened.append(record)
+            for card in self._open_cards:
+                card["names"].append(record)
+        elif tag == "time":
+            record = {"text": [], "datetime": attrib.get("datetime")}
+            opened.append(record)
+            for card in self._open_cards:
+                card["times"].append(record)
+
+        card = None
+        for i, matcher in enumerate(PROFILE_CARD_MATCHERS):
+            if _matches(matcher, tag, attrib):
+                if card is None:
+                    card = {"names": [], "times": []}
+                self._cards[i].append(card)
+
+        if tag in ("script", "style"):
+            self._skip += 1
+        self._active.extend(opened)
+        self._stack.append((tag, opened, card))
+        if card is not None:
+            self._open_cards.append(card)
+
+    def end(self, tag):
+        self._flush()
+        _, opened, card = self._stack.pop()
+        if opened:
+            del self._active[-len(opened):]
+        if card is not None:
+            self._open_cards.pop()
+        if tag in ("script", "style"):
+            self._skip -= 1
+
+    def data(self, data):
+        if not self._skip:
+            self._text.append(data)
+
+    def close(self):
+        self._flush()
+
+        for record in self._names:
+            if record is not None and "".join(record["text"]).strip():
+                self.name = "".join(record["text"]).strip()
+                break
+
+        cards = []
+        for matcher, containers in zip(PROFILE_CARD_MATCHERS, self._cards):
+            if containers:
+                self.selector = matcher[0]
+                self.card_count = len(containers)
+                cards = containers
+                break
+
+        for idx, card in enumerate(cards):
+            try:
+                certification = self._certification_from_card(card)
+            except Exception as e:
+                log.debug("Error parsing badge %d: %s", idx, e)
+                continue
+            if certification is not None:
+                self.results.append(certification)
+        return self.results
+
+    @staticmethod
+    def _certification_from_card(card):
+        """
+        Build a certification dict from a card's records (None without a name).
+        """
+        # Extract certification name, skipping common UI elements
+        cert_name = "N/A"
+        for record in card["names"]:
+            text = "".join(record["text"]).strip()
+            if 5 < len(text) < 150 and text.lower() not in CARD_UI_TEXTS:
+                cert_name = text
+                break
+        if cert_name == "N/A":
+            return None
+
+        # Dates found in the card's text nodes while parsing
+        cert_date = card.get("issued", "N/A")
+        cert_expiry = card.get("expires", "N/A")
+
+        # Time elements take precedence
+        dates = [
+            time["datetime"] if time["datetime"] is not None else "".join(time["text"]).strip()
+            for time in card["times"][:2]
         ]
+        if len(dates) >= 1:
+            cert_date = dates[0]
+        if len(dates) >= 2:
+            cert_expiry = dates[1]
+
+        return {
+            "Certification Name": cert_name,
+            "Certification Date": cert_date,
+            "Certification Expiry Date": cert_expiry
+        }
+
+
+@_cached_scrape
+def scrape_credly(url):
+    """
+    Scrape user name and certification details from Credly profile page.
+    """
+    # Reuse the shared Selenium WebDriver, starting from a clean session
+    driver = _get_driver()
+    
+    try:
+        driver.delete_all_cookies()
         
-        for tag, attrs in name_selectors:
-            element = soup.find(tag, attrs)
-            if element and element.text.strip():
-                name = element.text.strip()
-                print(f"  Found name: {name}")
-                break
+        # Navigate to the URL
+        log.debug("Loading page %s", url)
+        _load_page(driver, url)
         
-        # Extract certifications - badges are typically in card/grid layouts
-        certifications = []
+        # Wait until the first badges have rendered
+        log.debug("Waiting for content to load...")
+        _wait_for_page(driver, PROFILE_BADGE_CSS, 20)
         
-        # Try to find badge containers with various possible class names
-        badge_containers = []
+        # Scroll to load all badges (lazy loading)
+        _scroll_until_loaded(driver)
         
-        # Common patterns for Credly badge cards
-        possible_selectors = [
-            ("div", {"class": lambda x: x and "badge" in " ".join(x).lower()}),
-            ("div", {"class": lambda x: x and "card" in " ".join(x).lower()}),
-            ("a", {"class": lambda x: x and "badge" in " ".join(x).lower()}),
-            ("div", {"data-badge-id": True}),
-        ]
+        # Get the page source after JavaScript has rendered, as UTF-8 bytes
+        # so libxml2 decodes it once with no encoding detection
+        content = driver.page_source.encode("utf-8")
         
-        for tag, attrs in possible_selectors:
-            containers = soup.find_all(tag, attrs)
-            if containers:
-                badge_containers = containers
-                print(f"  Found {len(containers)} badges using {tag} with {attrs}")
-                break
+        # Stream the page through lxml, collecting only the name and badge cards
+        target = BadgeTarget()
+        parser = etree.HTMLParser(target=target, encoding="utf-8")
+        parser.feed(content)
+        certifications = parser.close()
         
-        if not badge_containers:
-            print(f"  No badges found. Saving HTML for debugging...")
-            with open("debug_page.html", "w", encoding="utf-8") as f:
-                f.write(content)
+        name = target.name
+        if name != "N/A":
+            log.debug("Found name: %s", name)
         
-        # Extract details from each badge
-        for idx, card in enumerate(badge_containers):
-            try:
-                # Extract certification name
-                cert_name = "N/A"
-                name_tags = card.find_all(["h2", "h3", "h4", "div", "span"])
-                for tag in name_tags:
-                    text = tag.text.strip()
-                    if text and len(text) > 5 and len(text) < 150:
-                        # Skip common UI elements
-                        if text.lower() not in ["view badge", "share", "download", "verify"]:
-                            cert_name = text
-                            break
-                
-                # Extract dates - look for date-related text
-                cert_date = "N/A"
-                cert_expiry = "N/A"
-                
-                # Search for date patterns in text
-                all_text = card.get_text(separator=" | ")
-                text_parts = [p.strip() for p in all_text.split("|")]
-                
-                for part in text_parts:
-                    part_lower = part.lower()
-                    if "issued" in part_lower or "earned" in part_lower:
-                        cert_date = part
-                    elif "expires" in part_lower or "expiration" in part_lower:
-                        cert_expiry = part
-                
-                # Look for time elements
-                time_elements = card.find_all("time")
-                if len(time_elements) >= 1:
-                    cert_date = time_elements[0].get("datetime", time_elements[0].text.strip())
-                if len(time_elements) >= 2:
-                    cert_expiry = time_elements[1].get("datetime", time_elements[1].text.strip())
-                
-                if cert_name != "N/A":
-                    certifications.append({
-                        "Certification Name": cert_name,
-                        "Certification Date": cert_date,
-                        "Certification Expiry Date": cert_expiry
-                    })
-            
-            except Exception as e:
-                print(f"  Error parsing badge {idx}: {str(e)}")
-                continue
+        if target.selector:
+            log.debug("Found %d badges using %s", target.card_count, target.selector)
+        elif log.isEnabledFor(logging.DEBUG):
+            log.debug("No badges found. Saving HTML to debug_page.html")
+            with open("debug_page.html", "wb") as f:
+                f.write(content)
         
-        print(f"  Extracted {len(certifications)} certifications")
+        log.debug("Extracted %d certifications", len(certifications))
         return {"Name": name, "Certifications": certifications}
     
     except TimeoutException:
-        print(f"  Timeout waiting for page elements")
+        log.warning("Timeout waiting for page elements on %s", url)
         return {"Name": "N/A", "Certifications": [], "Error": "Timeout"}
     
-    except Exception as e:
-        print(f"  Error: {str(e)}")
+    except WebDriverException as e:
+        # The browser may be gone; start a new one on the next call
+        log.warning("Error scraping %s: %s", url, e)
+        _quit_driver()
         return {"Name": "N/A", "Certifications": [], "Error": str(e)}
     
-    finally:
-        driver.quit()
+    except Exception as e:
+        log.warning("Error scraping %s: %s", url, e)
+        return {"Name": "N/A", "Certifications": [], "Error": str(e)}
+
 
+def _certification_from_badge_text(text):
+    """
+    Build a certification dict from a badge card's rendered text. The card's
+    lines hold the holder (line 1), issue date (2), expiry date (3) and
+    certification name (6); raises IndexError for shorter cards.
+    """
+    lines = text.split("\n")
+    return {
+        "Certification Name": lines[6].strip(),
+        "User Name": lines[1].split()[5:],
+        "Certification Issue Date": lines[2],
+        "Certification Expiry Date": lines[3],
+    }
 
+
+# Badges read per page by scrape_credly_alternative
+MAX_BADGES = 5
+
+# In-page script returning, in one round-trip:
+#   name: the trimmed innerText of the first element matched by the first of
+#         the XPaths in arguments[0] whose first match has any text
+#   badges: the innerText of the first arguments[2] elements matched by the
+#           first of the XPaths in arguments[1] that matches anything
+PAGE_TEXTS_JS = """
+const nameXpaths = arguments[0], badgeXpaths = arguments[1], limit = arguments[2];
+let name = null;
+for (const xpath of nameXpaths) {
+    const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const text = node ? (node.innerText || "").trim() : "";
+    if (text) {
+        name = text;
+        break;
+    }
+}
+const badges = [];
+for (const xpath of badgeXpaths) {
+    const found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    if (found.snapshotLength) {
+        for (let i = 0; i < Math.min(found.snapshotLength, limit); i++) {
+            badges.push(found.snapshotItem(i).innerText || "");
+        }
+        break;
+    }
+}
+return {name: name, badges: badges};
+"""
+
+
+@_cached_scrape
 def scrape_credly_alternative(url):
     """
     Alternative approach using Selenium's direct element finding.
     This method inspects the page structure dynamically.
+    
+    Credly's JSON API is tried first; the browser is only started if the
+    API cannot serve the URL.
     """
-    service = Service(executable_path="/Users/sam/Documents/Langgraph/CertAnalysis/lgcertenv/chromedriver")
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    data = scrape_credly_api(url)
+    if data is not None:
+        return data
     
-    driver = webdriver.Chrome(service=service, options=options)
+    # Reuse the shared Selenium WebDriver, starting from a clean session
+    driver = _get_driver()
     
     try:
-        #print(f"  Loading page...")
-        driver.get(url)
+        driver.delete_all_cookies()
         
-        # Wait and scroll
-        #wait = WebDriverWait(driver, 20)
-        wait = WebDriverWait(driver, 5) # Added by Sam
-        time.sleep(3)
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        log.debug("Loading page %s", url)
+        _load_page(driver, url)
         
-        # Find name
-        name = "N/A"
+        # Wait for the badges to render, then scroll to load the rest
+        badge_css = ", ".join(BADGE_CSS_SELECTORS)
         try:
-            # Try multiple XPath patterns for name
-            name_xpaths = [
-                "//h1[contains(@class, 'profile')]",
-                "//h1",
-                "//*[contains(@class, 'user-name')]",
-            ]
-            for xpath in name_xpaths:
-                try:
-                    name_elem = driver.find_element(By.XPATH, xpath)
-                    if name_elem.text.strip():
-                        name = name_elem.text.strip()
-                        #print(f"  Found name: {name}")
-                        break
-                except:
-                    continue
-        except Exception as e:
-            print(f"  Could not find name: {str(e)}")
+            _wait_for_page(driver, badge_css, 5)
+        except TimeoutException:
+            # Still on the previous page: its badges must not be read as this URL's
+            if _page_is_stale(driver):
+                log.warning("Timeout waiting for %s to load", url)
+                return {"Name": "N/A", "Certifications": [], "Error": "Timeout"}
+            # Otherwise no badges rendered; the lookups below come back empty
+        _scroll_until_loaded(driver)
         
-        # Find badges
+        name_xpaths = [
+            "//h1[contains(@class, 'profile')]",
+            "//h1",
+            "//*[contains(@class, 'user-name')]",
+        ]
+        badge_xpaths = [
+            "//*[contains(@class, 'badge') and contains(@class, 'card')]",
+            #"//*[contains(@class, 'badges') and contains(@class, 'card')]", # Added by Sam
+            "//*[contains(@data-badge-id, '')]",
+            "//a[contains(@href, '/badges/')]",
+        ]
+        
+        # Read the name and the first few badges in one browser round-trip
+        name = "N/A"
         certifications = []
         try:
-            # Try to find badge elements
-            badge_xpaths = [
-                "//*[contains(@class, 'badge') and contains(@class, 'card')]",
-                #"//*[contains(@class, 'badges') and contains(@class, 'card')]", # Added by Sam
-                "//*[contains(@data-badge-id, '')]",
-                "//a[contains(@href, '/badges/')]",
-            ]
+            texts = driver.execute_script(PAGE_TEXTS_JS, name_xpaths, badge_xpaths, MAX_BADGES)
+            if texts["name"]:
+                name = texts["name"]
+                log.debug("Found name: %s", name)
             
-            badge_elements = []
-            for xpath in badge_xpaths:
+            for text in texts["badges"]:
                 try:
-                    elements = driver.find_elements(By.XPATH, xpath)
-                    if elements:
-                        badge_elements = elements
-                        #print(f"  Found {len(elements)} badge elements")
-                        break
-                except:
-                    continue
-            
-            for badge in badge_elements[:5]:  # Limit to first 20 badges
-                try:
-                    cert_user_name = badge.text.split("\n")[1] # Added by Sam later
-                    #print("Certification Company : ",cert_user_name) # Added by Sam
-                    cert_issue_date = badge.text.split("\n")[2] # Added by Sam later
-                    #print("Certification Issue Data : ",cert_issue_date) # Added by Sam
-                    cert_expiry_date = badge.text.split("\n")[3] # Added by Sam later
-                    #print("Certification Issue Data : ",cert_expiry_date) # Added by Sam
-                    cert_date2 = badge.text.split("\n")[4] # Added by Sam later
-                    #print("Certification Issue Data : ",cert_date2) # Added by Sam
-                    cert_date3 = badge.text.split("\n")[5] # Added by Sam later
-                    #print("Certification Issue Data : ",cert_date3) # Added by Sam
-                    cert_name = badge.text.split("\n")[6] # Added by Sam later
-                    #print("Certification Issue Data : ",cert_name) # Added by Sam
-                    #print("Badge Text :", badge.text.split("\n"))
-                    #cert_name = badge.get_attribute("title") or badge.text.split("\n")[0] or "N/A"
-                    certifications.append({
-                        "Certification Name": cert_name.strip(),
-                        #"Certification Date": "N/A",
-                        "User Name": cert_user_name.split()[5:],
-                        "Certification Issue Date": cert_issue_date, # Added by Sam
-                        "Certification Expiry Date": cert_expiry_date
-                    })
-                except:
+                    certifications.append(_certification_from_badge_text(text))
+                except IndexError:
                     continue
         
         except Exception as e:
-            print(f"  Error finding badges: {str(e)}")
+            log.warning("Error reading name and badges: %s", e)
         
-        #print(f"  Extracted {len(certifications)} certifications")
+        log.debug("Extracted %d certifications", len(certifications))
         return {"Name": name, "Certifications": certifications}
     
+    except WebDriverException:
+        # The browser may be gone; start a new one on the next call
+        _quit_driver()
+        raise
+
+
+# Batch scraping: worker processes, each with its own long-lived Chrome
+# (WebDriver does not play well with threads, so processes are used)
+MAX_SCRAPER_WORKERS = 4
+WORKER_MAX_TASKS = 20  # Recycle a worker (and its Chrome) after this many URLs
+
+
+def _init_worker_driver():
+    """
+    Pool initializer: quit the worker's Chrome when the worker exits.
+    Pool workers skip atexit handlers, so a multiprocessing finalizer is used.
+    Chrome itself is still started lazily, only if the API path falls back to it.
+    """
+    Finalize(None, _quit_driver, exitpriority=10)
+
+
+def scrape_many(urls, processes=MAX_SCRAPER_WORKERS):
+    """
+    Scrape several Credly URLs in parallel worker processes.
+    Returns the results in the same order as urls.
+    """
+    pool = multiprocessing.Pool(
+        max(1, min(processes, len(urls))),
+        initializer=_init_worker_driver,
+        maxtasksperchild=WORKER_MAX_TASKS,
+    )
+    try:
+        return pool.map(scrape_credly_alternative, urls)
     finally:
-        driver.quit()
+        # close/join (not terminate) so workers run their finalizers and quit Chrome
+        pool.close()
+        pool.join()
 
 
-# Main execution
-if __name__ == "__main__":
-    #import sys
+# Concurrent requests to Credly's JSON API in a batch
+API_CONCURRENCY = 16
+
+# Batch results have scrape_credly_alternative's shape, so they share its
+# result cache entries
+BATCH_CACHE_SCRAPER = scrape_credly_alternative.__name__
+
+
+async def _fetch_credly_api(session, semaphore, url):
+    """
+    aiohttp counterpart of scrape_credly_api, sharing its ETag cache.
+    Returns None if the URL needs a browser instead.
+    """
+    api_url = _credly_api_url(url)
+    if api_url is None:
+        return None
     
-    #if len(sys.argv) < 2:
-    #    print(json.dumps({"error": "No URL provided"}))
-    #    sys.exit(1)
+    # SQLite calls are blocking, so they run off the event loop
+    cached = await asyncio.to_thread(_load_cached_response, api_url)
+    headers = {"If-None-Match": cached[0]} if cached else {}
     
-    #url = sys.argv[1]  # Get URL from command line argument
-    #data = scrape_credly_alternative(url)
+    try:
+        async with semaphore, session.get(api_url, headers=headers) as response:
+            if response.status == 304 and cached:
+                return _parse_credly_json(json.loads(cached[1]))
+            if response.status == 403:
+                return None
+            response.raise_for_status()
+            body = await response.text()
+        
+        etag = response.headers.get("ETag")
+        if etag:
+            await asyncio.to_thread(_store_cached_response, api_url, etag, body)
+        return _parse_credly_json(json.loads(body))
+    
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+        log.warning("Error scraping %s: %s", url, e)
+        return {"Name": "N/A", "Certifications": [], "Error": str(e)}
+
+
+async def scrape_many_api(urls, max_concurrency=API_CONCURRENCY):
+    """
+    Fetch several Credly URLs from the JSON API concurrently, with at most
+    max_concurrency requests in flight. URLs scraped within SCRAPE_CACHE_TTL
+    are served from the result cache. Returns the results in the same
+    order as urls, with None for the URLs that need a browser.
+    """
+    results = await asyncio.gather(*(asyncio.to_thread(_get_scraped, BATCH_CACHE_SCRAPER, url) for url in urls))
     
-    # Print as JSON to stdout
-    #print(json.dumps(data))
-    #urls = [
-       # "https://www.credly.com/users/cladius/badges",
-       # "https://www.credly.com/users/tushar-ghorpade/badges",
-     #   "https://www.credly.com/badges/90ee2ee9-f6cf-4d9b-8a52-f631d8644d58",
-    #]
+    missing = [idx for idx, data in enumerate(results) if data is None]
+    if missing:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(headers=API_HEADERS, timeout=timeout) as session:
+            fetched = await asyncio.gather(*(_fetch_credly_api(session, semaphore, urls[idx]) for idx in missing))
+        
+        for idx, data in zip(missing, fetched):
+            results[idx] = data
+            if data is not None:
+                await asyncio.to_thread(_put_scraped, BATCH_CACHE_SCRAPER, urls[idx], data)
     
-    #print("Starting Credly scraping...")
-    #print("=" * 60)
+    return results
+
+
+async def _block_unneeded_requests(route):
+    """
+    Playwright route handler that aborts requests in BLOCKED_RESOURCE_TYPES
+    or to TRACKER_HOSTS, the counterpart of the Selenium driver's blocking.
+    """
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in TRACKER_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def scrape_credly_pw(url, context):
+    """
+    Playwright version of scrape_credly_alternative's browser path.
+    Opens a page in a shared browser context, so many URLs can be scraped
+    concurrently on one browser.
+    """
+    page = await context.new_page()
     
-    #for url in urls:
-    #print(f"\nScraping: {url}")
-    #print("-" * 60)
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector(", ".join(BADGE_CSS_SELECTORS), timeout=10000)
+        except PlaywrightTimeoutError:
+            pass
+        try:
+            await asyncio.wait_for(
+                page.evaluate(SCROLL_TO_END_PW_JS, [SCROLL_POLL_MS, SCROLL_IDLE_POLLS]), SCRIPT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            pass  # Keep the badges loaded so far
         
-        # Try primary method
-        #data = scrape_credly(url)
-    #data = scrape_credly_alternative(url)
-    data = scrape_credly_alternative("https://www.credly.com/badges/e192db17-f8c5-46aa-8f99-8a565223f1d6?")
+        # Find name
+        name = "N/A"
+        for selector in NAME_CSS_SELECTORS:
+            element = await page.query_selector(selector)
+            if element:
+                text = (await element.inner_text()).strip()
+                if text:
+                    name = text
+                    break
         
-        # If no certifications found, try alternative method
-        #if not data.get("Certifications"):
-        #    print("  Trying alternative scraping method...")
-        #    data = scrape_credly_alternative(url)
+        # Find badges
+        badge_elements = []
+        for selector in BADGE_CSS_SELECTORS:
+            badge_elements = await page.query_selector_all(selector)
+            if badge_elements:
+                break
         
-    #print(f"\nResults for {url}:")
-    #print(json.dumps(data, indent=2))
-    #print("=" * 60)
+        certifications = []
+        for badge in badge_elements[:MAX_BADGES]:
+            try:
+                certifications.append(_certification_from_badge_text(await badge.inner_text()))
+            except IndexError:
+                continue
+        
+        return {"Name": name, "Certifications": certifications}
+    
+    except Exception as e:
+        log.warning("Error scraping %s: %s", url, e)
+        return {"Name": "N/A", "Certifications": [], "Error": str(e)}
+    
+    finally:
+        await page.close()
+
+
+async def scrape_many_pw(urls, max_workers=MAX_SCRAPER_WORKERS):
+    """
+    Scrape several Credly URLs concurrently with Playwright.
+    Credly's JSON API is tried first for every URL; one headless Chromium is
+    launched only for the URLs it cannot serve, with at most max_workers
+    pages open at a time. Returns the results in the same order as urls.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    results = await scrape_many_api(urls)
+    
+    pending = [idx for idx, data in enumerate(results) if data is None]
+    if pending:
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True)
+            try:
+                context = await browser.new_context(user_agent=USER_AGENT)
+                await context.route("**/*", _block_unneeded_requests)
+                
+                async def scrape(url):
+                    async with semaphore:
+                        return await scrape_credly_pw(url, context)
+                
+                scraped = await asyncio.gather(*(scrape(urls[idx]) for idx in pending))
+            finally:
+                await browser.close()
+        
+        for idx, data in zip(pending, scraped):
+            results[idx] = data
+            await asyncio.to_thread(_put_scraped, BATCH_CACHE_SCRAPER, urls[idx], data)
+    
+    return results
+
+
+# Main execution
+if __name__ == "__main__":
+    # URLs from the command line, or the sample badges
+    urls = sys.argv[1:] or [
+        "https://www.credly.com/badges/e192db17-f8c5-46aa-8f99-8a565223f1d6",
+        "https://www.credly.com/badges/90ee2ee9-f6cf-4d9b-8a52-f631d8644d58",
+    ]
+    
+    logging.basicConfig(level=os.getenv("LOG", "WARNING").upper())
+    
+    print("Starting Credly scraping...")
+    print("=" * 60)
+    
+    # Playwright drives all pages from one browser; otherwise the API batch
+    # runs first and the Selenium pool takes the URLs it cannot serve
+    if async_playwright is not None:
+        results = asyncio.run(scrape_many_pw(urls))
+    else:
+        results = asyncio.run(scrape_many_api(urls))
+        pending = [idx for idx, data in enumerate(results) if data is None]
+        if pending:
+            for idx, data in zip(pending, scrape_many([urls[idx] for idx in pending])):
+                results[idx] = data
+    
+    for url, data in zip(urls, results):
+        print(f"\nResults for {url}:")
+        print(json.dumps(data, indent=2))
+        print("=" * 60)